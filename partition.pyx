@@ -0,0 +1,44 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython version of the three-way partition from task1.py.
+Build in place with: cythonize -i partition.pyx
+"""
+from libc.stdint cimport int64_t
+
+
+cdef void partition_range(int64_t[::1] arr, Py_ssize_t low, Py_ssize_t high,
+                          Py_ssize_t *lt_out, Py_ssize_t *gt_out) noexcept nogil:
+    """Three-way partition of arr[low..high] around arr[high]"""
+    cdef int64_t pivot = arr[high]
+    cdef int64_t tmp
+    cdef Py_ssize_t lt = low
+    cdef Py_ssize_t i = low
+    cdef Py_ssize_t gt = high
+    
+    while i <= gt:
+        if arr[i] < pivot:
+            tmp = arr[lt]; arr[lt] = arr[i]; arr[i] = tmp
+            lt += 1
+            i += 1
+        elif arr[i] > pivot:
+            tmp = arr[i]; arr[i] = arr[gt]; arr[gt] = tmp
+            gt -= 1
+        else:
+            i += 1
+    
+    lt_out[0] = lt
+    gt_out[0] = gt
+
+
+cpdef tuple deterministic_partition(int64_t[::1] arr, Py_ssize_t low, Py_ssize_t high):
+    """
+    Three-way partition function for deterministic QuickSort.
+    Uses the last element as pivot.
+    
+    Returns (lt, gt) such that arr[low..lt-1] < pivot,
+    arr[lt..gt] == pivot and arr[gt+1..high] > pivot.
+    """
+    cdef Py_ssize_t lt, gt
+    with nogil:
+        partition_range(arr, low, high, &lt, &gt)
+    return lt, gt
@@ -1,24 +1,50 @@
+import copy
+import math
 import random
+import sys
 import time
-import matplotlib.pyplot as plt
+from array import array
 import numpy as np
+from numba import njit
+
+# Optional Cython partition for int64 ndarrays, built with: cythonize -i partition.pyx
+try:
+    from partition import deterministic_partition as cython_partition
+except ImportError:
+    cython_partition = None
 
 
 def deterministic_partition(arr, low, high):
     """
-    Partition function for deterministic QuickSort.
+    Three-way partition function for deterministic QuickSort.
     Uses the last element as pivot.
+    
+    Returns (lt, gt) such that arr[low..lt-1] < pivot,
+    arr[lt..gt] == pivot and arr[gt+1..high] > pivot.
     """
-    pivot = arr[high]
-    i = low - 1
+    if (cython_partition is not None and isinstance(arr, np.ndarray) and arr.dtype == np.int64
+            and arr.flags.c_contiguous and arr.flags.writeable):
+        return cython_partition(arr, low, high)
     
-    for j in range(low, high):
-        if arr[j] <= pivot:
+    pivot = arr[high]
+    lt = low
+    i = low
+    gt = high
+    
+    # Tuple-style swaps compile to a stack SWAP without building a tuple,
+    # so they are kept instead of an explicit temporary
+    while i <= gt:
+        if arr[i] < pivot:
+            arr[lt], arr[i] = arr[i], arr[lt]
+            lt += 1
+            i += 1
+        elif arr[i] > pivot:
+            arr[i], arr[gt] = arr[gt], arr[i]
+            gt -= 1
+        else:
             i += 1
-            arr[i], arr[j] = arr[j], arr[i]
     
-    arr[i + 1], arr[high] = arr[high], arr[i + 1]
-    return i + 1
+    return lt, gt
 
 
 def randomized_partition(arr, low, high):
@@ -26,74 +52,282 @@ def randomized_partition(arr, low, high):
     Partition function for randomized QuickSort.
     Uses a randomly selected element as pivot.
     """
-    # Choose random pivot and swap with last element
-    random_index = random.randint(low, high)
+    # Choose random pivot and swap with last element. Rejection sampling on
+    # getrandbits skips the randint -> randrange -> _randbelow call chain
+    span = high - low + 1
+    if span <= 0:
+        raise ValueError(f"Порожній діапазон для вибору опорного елемента: [{low}, {high}]")
+    bits = span.bit_length()
+    offset = random.getrandbits(bits)
+    while offset >= span:
+        offset = random.getrandbits(bits)
+    random_index = low + offset
     arr[random_index], arr[high] = arr[high], arr[random_index]
     
     # Use deterministic partition with randomly chosen pivot
     return deterministic_partition(arr, low, high)
 
 
+# Subarrays of at most this many elements are finished with insertion sort
+INSERTION_SORT_THRESHOLD = 16
+
+
+def insertion_sort(arr, low, high):
+    """Sort arr[low..high] in place with insertion sort"""
+    for i in range(low + 1, high + 1):
+        key = arr[i]
+        j = i - 1
+        while j >= low and arr[j] > key:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = key
+
+
+def sift_down(arr, low, root, end):
+    """Restore max-heap property for heap stored in arr[low..end]"""
+    while True:
+        child = low + 2 * (root - low) + 1
+        if child > end:
+            return
+        if child + 1 <= end and arr[child] < arr[child + 1]:
+            child += 1
+        if arr[root] >= arr[child]:
+            return
+        arr[root], arr[child] = arr[child], arr[root]
+        root = child
+
+
+def heap_sort(arr, low, high):
+    """Sort arr[low..high] in place with heapsort"""
+    for root in range(low + (high - low - 1) // 2, low - 1, -1):
+        sift_down(arr, low, root, high)
+    
+    for end in range(high, low, -1):
+        arr[low], arr[end] = arr[end], arr[low]
+        sift_down(arr, low, low, end - 1)
+
+
+def introsort(arr, low, high, depth_limit, partition):
+    """
+    Introsort over arr[low..high]: QuickSort with the given partition,
+    heapsort once depth_limit is exhausted and insertion sort for small
+    subarrays.
+    
+    Runs iteratively: the larger subrange is pushed on an explicit stack
+    and the smaller one is processed in place, keeping the stack O(log n).
+    """
+    stack = [(low, high, depth_limit)]
+    
+    while stack:
+        low, high, depth_limit = stack.pop()
+        
+        while high - low >= INSERTION_SORT_THRESHOLD:
+            if depth_limit == 0:
+                heap_sort(arr, low, high)
+                break
+            depth_limit -= 1
+            
+            # Elements equal to the pivot are already in place
+            lt, gt = partition(arr, low, high)
+            if lt - low < high - gt:
+                stack.append((gt + 1, high, depth_limit))
+                high = lt - 1
+            else:
+                stack.append((low, lt - 1, depth_limit))
+                low = gt + 1
+        else:
+            insertion_sort(arr, low, high)
+
+
+def introsort_depth_limit(size):
+    """Maximum QuickSort depth before introsort switches to heapsort"""
+    return 2 * int(math.log2(size)) if size > 1 else 0
+
+
 def deterministic_quick_sort_helper(arr, low, high):
     """Helper function for deterministic QuickSort"""
-    if low < high:
-        pi = deterministic_partition(arr, low, high)
-        deterministic_quick_sort_helper(arr, low, pi - 1)
-        deterministic_quick_sort_helper(arr, pi + 1, high)
+    depth_limit = introsort_depth_limit(high - low + 1)
+    introsort(arr, low, high, depth_limit, deterministic_partition)
 
 
 def randomized_quick_sort_helper(arr, low, high):
     """Helper function for randomized QuickSort"""
-    if low < high:
-        pi = randomized_partition(arr, low, high)
-        randomized_quick_sort_helper(arr, low, pi - 1)
-        randomized_quick_sort_helper(arr, pi + 1, high)
+    depth_limit = introsort_depth_limit(high - low + 1)
+    introsort(arr, low, high, depth_limit, randomized_partition)
+
+
+@njit(cache=True, boundscheck=False)
+def compiled_quick_sort_helper(arr, randomized):
+    """
+    Iterative QuickSort over an int64 buffer, compiled with Numba.
+    Partition is inlined; the larger subrange is pushed on an explicit
+    stack and the smaller one is processed in place.
+    """
+    stack = [(0, len(arr) - 1)]
+    
+    while stack:
+        low, high = stack.pop()
+        
+        while low < high:
+            if randomized:
+                random_index = np.random.randint(low, high + 1)
+                arr[random_index], arr[high] = arr[high], arr[random_index]
+            
+            # Three-way partition; equal-to-pivot range is skipped
+            pivot = arr[high]
+            lt = low
+            i = low
+            gt = high
+            while i <= gt:
+                if arr[i] < pivot:
+                    arr[lt], arr[i] = arr[i], arr[lt]
+                    lt += 1
+                    i += 1
+                elif arr[i] > pivot:
+                    arr[i], arr[gt] = arr[gt], arr[i]
+                    gt -= 1
+                else:
+                    i += 1
+            
+            if lt - low < high - gt:
+                stack.append((gt + 1, high))
+                high = lt - 1
+            else:
+                stack.append((low, lt - 1))
+                low = gt + 1
+
+
+def check_int64_compatible(values):
+    """Raise TypeError unless ndarray values can be sorted as int64 without loss"""
+    if values.size and (values.dtype.kind not in 'iu' or not np.can_cast(values.dtype, np.int64)):
+        raise TypeError(
+            f"Скомпільований QuickSort підтримує лише цілі числа в межах int64, "
+            f"отримано {values.dtype}; використайте pure_python=True"
+        )
+
+
+@njit(cache=True)
+def seed_compiled_random(seed):
+    """Seed the random generator Numba keeps for compiled code (random.seed does not reach it)"""
+    np.random.seed(seed)
+
+
+def as_int64_buffer(arr):
+    """
+    Return an int64 ndarray sharing memory with arr for in-place sorting.
+    Only writable int64 ndarrays and array('q') are accepted.
+    """
+    if isinstance(arr, np.ndarray) and arr.dtype == np.int64 and arr.flags.writeable:
+        return arr
+    if isinstance(arr, array) and arr.typecode == 'q':
+        # array('q') exposes a contiguous int64 buffer, so no copy is needed
+        return np.frombuffer(arr, dtype=np.int64)
+    raise TypeError(
+        f"Сортування на місці підтримує лише ndarray int64 або array('q'), "
+        f"отримано {type(arr).__name__}"
+    )
 
 
-def deterministic_quick_sort(arr):
+def compiled_quick_sort(arr, randomized, in_place=False):
+    """
+    Sort array with the Numba-compiled QuickSort.
+    Returns ndarray for ndarray input, list otherwise.
+    With in_place=True arr must be an int64 ndarray or array('q')
+    and is sorted directly. Non-integer input raises TypeError
+    instead of being truncated.
+    """
+    if in_place:
+        compiled_quick_sort_helper(as_int64_buffer(arr), randomized)
+        return arr
+    
+    result = np.array(arr)
+    check_int64_compatible(result)
+    result = result.astype(np.int64, copy=False)
+    compiled_quick_sort_helper(result, randomized)
+    return result if isinstance(arr, np.ndarray) else result.tolist()
+
+
+def deterministic_quick_sort(arr, pure_python=False, in_place=False):
     """
     Deterministic QuickSort implementation.
     Uses the last element as pivot.
+    
+    By default the Numba-compiled version is used (integers only); pass
+    pure_python=True to run the Python introsort implementation. With in_place=True
+    arr itself is sorted instead of a copy.
     """
-    arr_copy = arr.copy()
+    if not pure_python:
+        return compiled_quick_sort(arr, randomized=False, in_place=in_place)
+    
+    arr_copy = arr if in_place else copy.copy(arr)
     deterministic_quick_sort_helper(arr_copy, 0, len(arr_copy) - 1)
     return arr_copy
 
 
-def randomized_quick_sort(arr):
+def randomized_quick_sort(arr, pure_python=False, in_place=False):
     """
     Randomized QuickSort implementation.
     Uses a randomly selected element as pivot.
+    
+    By default the Numba-compiled version is used (integers only); pass
+    pure_python=True to run the Python introsort implementation. With in_place=True
+    arr itself is sorted instead of a copy.
     """
-    arr_copy = arr.copy()
+    if not pure_python:
+        return compiled_quick_sort(arr, randomized=True, in_place=in_place)
+    
+    arr_copy = arr if in_place else copy.copy(arr)
     randomized_quick_sort_helper(arr_copy, 0, len(arr_copy) - 1)
     return arr_copy
 
 
 def generate_test_array(size):
     """Generate random array of given size"""
-    return [random.randint(1, 1000000) for _ in range(size)]
+    rng = np.random.default_rng(42)
+    return rng.integers(1, 1000000 + 1, size=size, dtype=np.int64).tolist()
+
+
+# Minimum total time spent in timed sorts per measurement
+MIN_MEASURE_TIME_NS = 200_000_000
 
 
-def measure_time(sort_function, arr, iterations=5):
+def measure_time(sort_function, arr):
     """
-    Measure average execution time of sorting function
-    over multiple iterations.
+    Measure average execution time of sorting function.
+    Sorts are repeated until they take at least MIN_MEASURE_TIME_NS
+    in total, like timeit's autorange.
     """
-    total_time = 0
-    
-    for _ in range(iterations):
-        test_arr = arr.copy()
-        start_time = time.time()
-        sort_function(test_arr)
-        end_time = time.time()
-        total_time += (end_time - start_time)
-    
-    return total_time / iterations
+    # Convert once so NumPy conversion is not charged to sort time, and
+    # reuse a single scratch buffer refilled from it before every run
+    source = np.asarray(arr, dtype=np.int64)
+    scratch = np.empty_like(source)
+    
+    # Warm up so JIT compilation is not charged to sort time
+    sort_function(source[:2])
+    
+    iterations = 0
+    total_time_ns = 0
+    
+    while iterations == 0 or total_time_ns < MIN_MEASURE_TIME_NS:
+        np.copyto(scratch, source)
+        start_time = time.perf_counter_ns()
+        sort_function(scratch, in_place=True)
+        end_time = time.perf_counter_ns()
+        total_time_ns += end_time - start_time
+        iterations += 1
+    
+    return total_time_ns / iterations / 1e9
 
 
 def run_performance_test():
-    """Run performance comparison between algorithms"""
+    """
+    Run performance comparison between algorithms.
+    
+    Measurements run one after another in this process: parallel workers
+    would compete for cache, memory bandwidth and clock boost, skewing the
+    comparison, and with compiled sorts the whole sweep is too short to
+    repay process startup.
+    """
     # Test array sizes
     sizes = [10000, 50000, 100000, 500000]
     
@@ -125,6 +359,15 @@ def run_performance_test():
 
 def create_performance_graph(sizes, randomized_times, deterministic_times):
     """Create performance comparison graph"""
+    import matplotlib
+    
+    # Non-interactive runs only save the file, so skip GUI backend setup
+    interactive = sys.stdout.isatty()
+    if not interactive:
+        matplotlib.use('Agg')
+    
+    import matplotlib.pyplot as plt
+    
     plt.figure(figsize=(12, 8))
     
     # Plot lines
@@ -144,9 +387,11 @@ def create_performance_graph(sizes, randomized_times, deterministic_times):
     # Add some styling
     plt.tight_layout()
     
-    # Show and save graph
-    plt.show()
-    plt.savefig('quicksort_comparison.png', dpi=300, bbox_inches='tight')
+    # Save graph before show() so the figure is rendered to file only once
+    plt.savefig('quicksort_comparison.png', dpi=150, bbox_inches='tight')
+    if interactive:
+        plt.show()
+    plt.close()
 
 
 def analyze_results(sizes, randomized_times, deterministic_times):
@@ -197,25 +442,81 @@ def test_correctness():
     test_arr = [64, 34, 25, 12, 22, 11, 90]
     expected = sorted(test_arr)
     
-    random_result = randomized_quick_sort(test_arr)
-    deterministic_result = deterministic_quick_sort(test_arr)
-    
-    assert random_result == expected, "Рандомізований QuickSort працює неправильно!"
-    assert deterministic_result == expected, "Детермінований QuickSort працює неправильно!"
-    
-    # Test case 2: Already sorted array
-    test_arr2 = [1, 2, 3, 4, 5]
-    expected2 = [1, 2, 3, 4, 5]
-    
-    assert randomized_quick_sort(test_arr2) == expected2
-    assert deterministic_quick_sort(test_arr2) == expected2
-    
-    # Test case 3: Reverse sorted array
-    test_arr3 = [5, 4, 3, 2, 1]
-    expected3 = [1, 2, 3, 4, 5]
-    
-    assert randomized_quick_sort(test_arr3) == expected3
-    assert deterministic_quick_sort(test_arr3) == expected3
+    for pure_python in (False, True):
+        random_result = randomized_quick_sort(test_arr, pure_python=pure_python)
+        deterministic_result = deterministic_quick_sort(test_arr, pure_python=pure_python)
+        
+        assert random_result == expected, "Рандомізований QuickSort працює неправильно!"
+        assert deterministic_result == expected, "Детермінований QuickSort працює неправильно!"
+        
+        # Test case 2: Already sorted array
+        test_arr2 = [1, 2, 3, 4, 5]
+        expected2 = [1, 2, 3, 4, 5]
+        
+        assert randomized_quick_sort(test_arr2, pure_python=pure_python) == expected2
+        assert deterministic_quick_sort(test_arr2, pure_python=pure_python) == expected2
+        
+        # Test case 3: Reverse sorted array
+        test_arr3 = [5, 4, 3, 2, 1]
+        expected3 = [1, 2, 3, 4, 5]
+        
+        assert randomized_quick_sort(test_arr3, pure_python=pure_python) == expected3
+        assert deterministic_quick_sort(test_arr3, pure_python=pure_python) == expected3
+        
+        # Test case 4: Duplicate-heavy array larger than insertion sort threshold
+        test_arr4 = [3, 1, 2] * 50 + [2] * 100
+        expected4 = sorted(test_arr4)
+        
+        assert randomized_quick_sort(test_arr4, pure_python=pure_python) == expected4
+        assert deterministic_quick_sort(test_arr4, pure_python=pure_python) == expected4
+    
+    # Test case 5: Long sorted input drives last-element pivots into the heapsort fallback
+    test_arr5 = list(range(200))
+    assert deterministic_quick_sort(test_arr5, pure_python=True) == test_arr5
+    
+    # Test case 6: int64 ndarrays on the Python path (Cython partition when built),
+    # including a strided view that the Cython memoryview cannot take
+    test_arr6 = np.array([3, 1, 2] * 20 + [5, 0], dtype=np.int64)
+    for randomized in (False, True):
+        sort_function = randomized_quick_sort if randomized else deterministic_quick_sort
+        assert sort_function(test_arr6, pure_python=True).tolist() == sorted(test_arr6.tolist())
+        strided = np.arange(80, 0, -1, dtype=np.int64)[::2]
+        sort_function(strided, pure_python=True, in_place=True)
+        assert strided.tolist() == list(range(2, 81, 2))
+    
+    # Test case 7: array('q') buffers on both paths, copied and in place
+    for pure_python in (False, True):
+        for sort_function in (deterministic_quick_sort, randomized_quick_sort):
+            buffer = array('q', [5, 3, 1, 2, 7, 6] * 5)
+            expected_buffer = sorted(buffer)
+            assert list(sort_function(buffer, pure_python=pure_python)) == expected_buffer
+            assert buffer[:3] == array('q', [5, 3, 1])
+            sort_function(buffer, pure_python=pure_python, in_place=True)
+            assert buffer.tolist() == expected_buffer
+    
+    # Compiled in-place sort rejects buffers that are not int64
+    for wrong_buffer in (array('i', [5, 3, 1]), array('d', [-1.5, 2.0]), [3, 1, 2]):
+        try:
+            deterministic_quick_sort(wrong_buffer, in_place=True)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("Сортування на місці прийняло буфер не int64!")
+    
+    # Test case 8: Non-integer input is sorted by the Python path and rejected by the compiled one
+    test_arr7 = [3.5, 1.2, 2.9]
+    assert deterministic_quick_sort(test_arr7, pure_python=True) == sorted(test_arr7)
+    assert randomized_quick_sort(test_arr7, pure_python=True) == sorted(test_arr7)
+    for sort_function in (deterministic_quick_sort, randomized_quick_sort):
+        try:
+            sort_function(test_arr7)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("Скомпільований QuickSort не повинен приймати дробові числа!")
+    
+    # Empty input
+    assert deterministic_quick_sort([]) == [] and randomized_quick_sort([]) == []
     
     print("✓ Всі тести пройдені успішно!")
 
@@ -224,6 +525,7 @@ def main():
     """Main function to run the complete analysis"""
     # Set random seed for reproducible results in testing
     random.seed(42)
+    seed_compiled_random(42)
     
     # Test correctness first
     test_correctness()
@@ -1,3 +1,6 @@
+import heapq
+
+
 # Визначення класу Teacher
 class Teacher:
     def __init__(self, first_name, last_name, age, email, can_teach_subjects):
@@ -27,7 +30,7 @@ class Teacher:
         return f"Teacher({self.first_name} {self.last_name}, {self.age}, {self.email}, {self.can_teach_subjects})"
 
 
-def create_schedule(subjects, teachers):
+def create_schedule(subjects, teachers, verbose=False):
     """
     Create class schedule using greedy algorithm for set cover problem.
     
@@ -42,74 +45,113 @@ def create_schedule(subjects, teachers):
     Args:
         subjects (set): Set of all subjects that need to be covered
         teachers (list): List of Teacher objects
+        verbose (bool): Print step-by-step progress of the algorithm
         
     Returns:
         list: List of teachers with assigned subjects, or None if impossible to cover all subjects
     """
-    # Make copies to avoid modifying original data
+    # Make copy to avoid modifying original data
     uncovered_subjects = subjects.copy()
-    available_teachers = [teacher for teacher in teachers]
     selected_teachers = []
     
     # Reset assigned subjects for all teachers
-    for teacher in available_teachers:
+    for teacher in teachers:
         teacher.assigned_subjects = set()
     
-    print("Початковий стан:")
-    print(f"Предмети для покриття: {uncovered_subjects}")
-    print(f"Доступні викладачі: {len(available_teachers)}")
-    print("-" * 50)
+    # Encode subject sets as integer bitmasks so coverage is a popcount
+    subject_to_bit = {subject: 1 << i for i, subject in enumerate(sorted(subjects))}
+    teacher_masks = [
+        sum(subject_to_bit[subject] for subject in teacher.can_teach_subjects
+            if subject in subject_to_bit)
+        for teacher in teachers
+    ]
+    uncovered_mask = (1 << len(subject_to_bit)) - 1
+    
+    # Max-heap by coverage, then youngest, then original order. Coverage only
+    # shrinks, so stored values are upper bounds and are refreshed lazily on pop.
+    # Entries carry the teacher mask so the loop needs no extra lookups
+    heap = [
+        (-(teacher_mask & uncovered_mask).bit_count(), teacher.age, index, teacher_mask, teacher)
+        for index, (teacher, teacher_mask) in enumerate(zip(teachers, teacher_masks))
+    ]
+    heapq.heapify(heap)
+    heappop = heapq.heappop
+    heappush = heapq.heappush
+    
+    if verbose:
+        print("Початковий стан:")
+        print(f"Предмети для покриття: {uncovered_subjects}")
+        print(f"Доступні викладачі: {len(teachers)}")
+        print("-" * 50)
     
     step = 1
     
     while uncovered_subjects:
-        print(f"Крок {step}:")
-        print(f"Непокриті предмети: {uncovered_subjects}")
+        if verbose:
+            print(f"Крок {step}:")
+            print(f"Непокриті предмети: {uncovered_subjects}")
         
         # Find teacher who can cover the most uncovered subjects
         best_teacher = None
+        best_mask = None
         max_coverage = 0
         
-        for teacher in available_teachers:
-            # Calculate how many uncovered subjects this teacher can teach
-            coverage = len(teacher.can_teach_subjects & uncovered_subjects)
+        while heap:
+            negative_coverage, age, index, teacher_mask, teacher = heappop(heap)
             
-            if coverage > max_coverage:
-                max_coverage = coverage
-                best_teacher = teacher
-            elif coverage == max_coverage and coverage > 0:
-                # If same coverage, choose younger teacher
-                if teacher.age < best_teacher.age:
-                    best_teacher = teacher
+            # Calculate how many uncovered subjects this teacher can teach now
+            coverage = (teacher_mask & uncovered_mask).bit_count()
+            
+            if coverage < -negative_coverage:
+                # Stale entry: re-insert with current coverage
+                if coverage > 0:
+                    heappush(heap, (-coverage, age, index, teacher_mask, teacher))
+                continue
+            
+            # Up-to-date entry on top: no one covers more, ties go to youngest.
+            # This is the earliest safe exit; accepting a stale entry just because
+            # it covers everything left could skip a younger teacher with equal coverage
+            max_coverage = coverage
+            best_teacher = teacher
+            best_mask = teacher_mask
+            break
         
         # If no teacher can cover any uncovered subjects, schedule is impossible
         if best_teacher is None or max_coverage == 0:
-            print(f"Неможливо покрити предмети: {uncovered_subjects}")
+            if verbose:
+                print(f"Неможливо покрити предмети: {uncovered_subjects}")
             return None
         
         # Assign subjects to the best teacher
         subjects_to_assign = best_teacher.can_teach_subjects & uncovered_subjects
         best_teacher.assigned_subjects = subjects_to_assign
         
-        print(f"Обрано викладача: {best_teacher}")
-        print(f"Призначені предмети: {subjects_to_assign}")
+        if verbose:
+            print(f"Обрано викладача: {best_teacher}")
+            print(f"Призначені предмети: {subjects_to_assign}")
         
-        # Remove covered subjects and used teacher
+        # Remove covered subjects; used teacher is already popped from the heap
         uncovered_subjects -= subjects_to_assign
-        available_teachers.remove(best_teacher)
+        uncovered_mask &= ~best_mask
         selected_teachers.append(best_teacher)
         
-        print(f"Залишилося предметів: {len(uncovered_subjects)}")
-        print("-" * 50)
+        if verbose:
+            print(f"Залишилося предметів: {len(uncovered_subjects)}")
+            print("-" * 50)
         
         step += 1
     
-    print("Розклад успішно створено!")
+    if verbose:
+        print("Розклад успішно створено!")
+    
     return selected_teachers
 
 
-def print_detailed_schedule(schedule):
-    """Print detailed schedule information"""
+def print_detailed_schedule(schedule, show_capabilities=True):
+    """
+    Print detailed schedule information.
+    Pass show_capabilities=False to skip listing all subjects each teacher can teach.
+    """
     if not schedule:
         print("Розклад відсутній.")
         return
@@ -124,7 +166,8 @@ def print_detailed_schedule(schedule):
         print(f"\n{i}. {teacher.first_name} {teacher.last_name}")
         print(f"   Вік: {teacher.age} років")
         print(f"   Email: {teacher.email}")
-        print(f"   Може викладати: {', '.join(sorted(teacher.can_teach_subjects))}")
+        if show_capabilities:
+            print(f"   Може викладати: {', '.join(sorted(teacher.can_teach_subjects))}")
         print(f"   Призначені предмети: {', '.join(sorted(teacher.assigned_subjects))}")
         all_assigned_subjects.update(teacher.assigned_subjects)
     
@@ -140,9 +183,7 @@ def analyze_coverage(subjects, teachers):
     print("\nАНАЛІЗ ПОКРИТТЯ:")
     print("-" * 30)
     
-    all_teachable_subjects = set()
-    for teacher in teachers:
-        all_teachable_subjects.update(teacher.can_teach_subjects)
+    all_teachable_subjects = set().union(*(teacher.can_teach_subjects for teacher in teachers))
     
     missing_subjects = subjects - all_teachable_subjects
     
@@ -176,7 +217,7 @@ def test_impossible_schedule():
     # Спроба створити розклад
     print("\nСпроба створення розкладу:")
     print("-" * 30)
-    test_schedule = create_schedule(test_subjects, test_teachers)
+    test_schedule = create_schedule(test_subjects, test_teachers, verbose=True)
     
     if test_schedule:
         print("Неочікувано: розклад створено!")
@@ -185,6 +226,34 @@ def test_impossible_schedule():
         print("Очікувано: неможливо створити повний розклад.")
 
 
+def test_large_schedule():
+    """Test case with more subjects than fit in 64 bits of the subject bitmask"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ: ВЕЛИКА КІЛЬКІСТЬ ПРЕДМЕТІВ")
+    print("=" * 60)
+    
+    test_subjects = {f"Предмет {i:03d}" for i in range(100)}
+    first_part = {f"Предмет {i:03d}" for i in range(40)}
+    second_part = test_subjects - first_part
+    test_teachers = [
+        Teacher("Тест", "Викладач1", 40, "test1@example.com", first_part),
+        Teacher("Тест", "Викладач2", 50, "test2@example.com", second_part),
+        Teacher("Тест", "Викладач3", 30, "test3@example.com", first_part),
+    ]
+    
+    print(f"Кількість тестових предметів: {len(test_subjects)}")
+    print(f"Тестові викладачі: {len(test_teachers)}")
+    
+    # Greedy picks the 60-subject teacher first, then the younger of two equal candidates
+    test_schedule = create_schedule(test_subjects, test_teachers)
+    expected = [test_teachers[1], test_teachers[2]]
+    
+    if test_schedule == expected and test_teachers[2].assigned_subjects == first_part:
+        print("Очікувано: обрано Викладач2 та молодшого Викладач3, всі предмети покриті.")
+    else:
+        print(f"Неочікувано: отримано розклад {test_schedule}")
+
+
 if __name__ == '__main__':
     # Множина предметів
     subjects = {'Математика', 'Фізика', 'Хімія', 'Інформатика', 'Біологія'}
@@ -218,7 +287,7 @@ if __name__ == '__main__':
     print("=" * 60)
     
     # Виклик функції створення розкладу
-    schedule = create_schedule(subjects, teachers)
+    schedule = create_schedule(subjects, teachers, verbose=True)
     
     # Виведення розкладу
     if schedule:
@@ -245,12 +314,13 @@ if __name__ == '__main__':
         print("Неможливо покрити всі предмети наявними викладачами.")
         
         # Показати яких предметів не вистачає
-        all_possible = set()
-        for teacher in teachers:
-            all_possible.update(teacher.can_teach_subjects)
+        all_possible = set().union(*(teacher.can_teach_subjects for teacher in teachers))
         missing = subjects - all_possible
         if missing:
             print(f"Предмети без викладачів: {missing}")
     
     # Тест неможливого розкладу
-    test_impossible_schedule() 
\ No newline at end of file
+    test_impossible_schedule()
+    
+    # Тест з великою кількістю предметів
+    test_large_schedule() 
\ No newline at end of file